@@ -1,19 +1,98 @@
+import hashlib
 import os
-from datetime import datetime # --- NEW --- Import datetime to handle dates
-from flask import Flask, jsonify, request
+import time
+import msgspec
+import orjson
+from datetime import date
+from flask import Flask, abort, current_app, jsonify, make_response, request
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import String, TypeDecorator, event, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+# All JSON encoding goes through here so cached and uncached responses match.
+# orjson handles date objects natively; anything else it doesn't know falls
+# back to Flask's own default handler.
+def _dumps_json(obj, default=DefaultJSONProvider.default, sort_keys=False):
+    option = orjson.OPT_NAIVE_UTC
+    if sort_keys:
+        option |= orjson.OPT_SORT_KEYS
+    return orjson.dumps(obj, default=default, option=option)
+
+# Serialize JSON responses with orjson
+class ORJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        # orjson always writes compact output, so only compact separators can be honoured
+        separators = kwargs.get('separators', (',', ':'))
+        if tuple(separators) != (',', ':') or kwargs.keys() - {'default', 'sort_keys', 'separators'}:
+            # Options orjson can't express go through the stdlib encoder
+            return super().dumps(obj, **kwargs)
+        return _dumps_json(obj, default=kwargs.get('default', self.default), sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode()
+
+    def response(self, *args, **kwargs):
+        # Same calling convention as jsonify(): one positional value, several
+        # positional values (sent as a list), or keyword arguments (sent as an object)
+        if args and kwargs:
+            raise TypeError('response() takes either args or kwargs, not both')
+        if len(args) == 1:
+            obj = args[0]
+        else:
+            obj = args or kwargs or None
+        return current_app.response_class(_dumps_json(obj, default=self.default, sort_keys=self.sort_keys), mimetype=self.mimetype)
 
 # Initialize the Flask application
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # --- DATABASE CONFIGURATION ---
-basedir = os.path.abspath(os.path.dirname(__file__))
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///' + os.path.join(basedir, 'pms.db')
+_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'pms.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{_DB_PATH}'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+# Keep a pool of open SQLite connections so pms.db isn't reopened on every request
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'poolclass': QueuePool,
+    'pool_size': 5,
+    'max_overflow': 10,
+    'pool_recycle': 3600,
+    'pool_pre_ping': False,
+    # Pooled connections may be handed to any worker thread
+    'connect_args': {'check_same_thread': False}
+}
 
 # Initialize the database extension
 db = SQLAlchemy(app)
 
+# Tune SQLite on every new connection: WAL lets reads run during writes and
+# NORMAL synchronous avoids an fsync on every commit
+@event.listens_for(Engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _):
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-65536")
+    cur.execute("PRAGMA mmap_size=268435456")
+    cur.close()
+
+# --- CUSTOM COLUMN TYPES ---
+
+# SQLite has no real DATE type, so dates are stored as 'YYYY-MM-DD' text anyway.
+# This type keeps them as ISO strings on read instead of parsing to date objects
+# and formatting them back again. ISO dates sort lexically in date order, so
+# ORDER BY and indexes still work as expected.
+class ISODate(TypeDecorator):
+    impl = String(10)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, str):
+            return value
+        return value.isoformat()
+
+    def process_result_value(self, value, dialect):
+        return value
+
 # --- DATABASE MODELS ---
 class Room(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -30,8 +109,8 @@ class Room(db.Model):
 class Booking(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     guest_name = db.Column(db.String(100), nullable=False)
-    check_in_date = db.Column(db.Date, nullable=False)
-    check_out_date = db.Column(db.Date, nullable=False)
+    check_in_date = db.Column(ISODate, nullable=False, index=True)
+    check_out_date = db.Column(ISODate, nullable=False)
     num_adults = db.Column(db.Integer, nullable=False, default=1)
     num_children = db.Column(db.Integer, nullable=False, default=0)
     phone_number = db.Column(db.String(20), nullable=True)
@@ -45,12 +124,130 @@ class Booking(db.Model):
     payment_method = db.Column(db.String(20), nullable=True)
     
     # The Relationship (Foreign Key)
-    room_id = db.Column(db.Integer, db.ForeignKey('room.id'), nullable=False)
+    room_id = db.Column(db.Integer, db.ForeignKey('room.id'), nullable=False, index=True)
 
     def __repr__(self):
         return f'<Booking for {self.guest_name} in Room {self.room_id}>'
 
 
+# --- REQUEST SCHEMAS ---
+
+# msgspec decodes the JSON body straight into these, checking required fields,
+# types and 'YYYY-MM-DD' dates in the same pass
+class RoomCreate(msgspec.Struct):
+    name: str
+    status: str = 'Available'
+
+class BookingCreate(msgspec.Struct):
+    guest_name: str
+    check_in_date: date
+    check_out_date: date
+    room_id: int
+    num_adults: int = 1
+    num_children: int = 0
+    phone_number: str | None = None
+    email: str | None = None
+
+_room_create_decoder = msgspec.json.Decoder(RoomCreate)
+_booking_create_decoder = msgspec.json.Decoder(BookingCreate)
+
+_REQUIRED_BOOKING_FIELDS = frozenset(('guest_name', 'check_in_date', 'check_out_date', 'room_id'))
+_INVALID_JSON_MESSAGE = 'Request body must be valid JSON'
+
+# msgspec's error text is not a stable API, so when a body fails validation we
+# re-inspect it to pick one of our own messages. msgspec stops at the first type
+# mismatch without reading the rest of the body, so the body may still turn out
+# to be malformed JSON here.
+def _room_error_message(body):
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return _INVALID_JSON_MESSAGE
+    if not isinstance(data, dict) or 'name' not in data:
+        return 'Room name is required'
+    return 'Invalid room data'
+
+def _booking_error_message(body):
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        return _INVALID_JSON_MESSAGE
+    if not isinstance(data, dict) or not _REQUIRED_BOOKING_FIELDS <= data.keys():
+        return 'Missing required fields'
+    try:
+        msgspec.convert(data['check_in_date'], date)
+        msgspec.convert(data['check_out_date'], date)
+    except msgspec.ValidationError:
+        return 'Invalid date format. Please use YYYY-MM-DD.'
+    return 'Invalid booking data'
+
+
+# --- QUERIES ---
+
+# Built once at import so every request reuses the same statement objects and
+# hits SQLAlchemy's compiled-SQL cache straight away
+_STMT_ALL_ROOMS = select(Room.id, Room.name, Room.status).order_by(Room.id)
+
+# Booking columns plus the room's name, joined in the same query
+_STMT_ALL_BOOKINGS = select(
+    Booking.id,
+    Booking.guest_name,
+    Booking.check_in_date,
+    Booking.check_out_date,
+    Booking.room_id,
+    Room.name.label('room_name')
+).join(Room).order_by(Booking.check_in_date)
+
+
+# --- HELPERS ---
+
+# Note on speeding up request parsing: JIT compilers like Numba (or Cython-style
+# typed helpers) don't help here. Numba has no support for str/datetime values,
+# mixed-type dicts or try/except, so our validation code would fall back to
+# object mode and run slower than plain Python. Instead we hand the heavy lifting
+# to C code: msgspec for the create endpoints and orjson for everything else.
+
+def _load_json_body():
+    """
+    Decodes the request body with orjson. Aborts with a JSON 400 on malformed JSON.
+    """
+    try:
+        return orjson.loads(request.get_data(cache=False))
+    except orjson.JSONDecodeError:
+        abort(make_response(jsonify({'message': _INVALID_JSON_MESSAGE}), 400))
+
+# In-process cache of encoded list responses, keyed by endpoint name.
+# Every write clears it, which only reaches the cache of the process that
+# handled the write. So the app must run as a single (multi-threaded)
+# process; see gunicorn.conf.py. The TTL is only a backstop for changes
+# made to pms.db outside the app.
+_CACHE_TTL = 5.0
+_cache = {}
+_cache_generation = 0
+
+def _bust_cache():
+    global _cache_generation
+    _cache_generation += 1
+    _cache.clear()
+
+def _cached_json_response(key, build):
+    """
+    Returns the cached JSON body for `key`, calling `build()` to refresh it when
+    missing or expired. Sends an ETag so clients can revalidate with a 304.
+    """
+    entry = _cache.get(key)
+    if entry is None or time.monotonic() - entry[2] > _CACHE_TTL:
+        generation = _cache_generation
+        body = _dumps_json(build(), sort_keys=app.json.sort_keys)
+        entry = (body, hashlib.sha1(body).hexdigest(), time.monotonic())
+        # Don't store a result that a concurrent write may already have made stale
+        if generation == _cache_generation:
+            _cache[key] = entry
+    response = app.response_class(entry[0], mimetype='application/json')
+    response.set_etag(entry[1])
+    return response.make_conditional(request)
+
+
 # --- API ROUTES ---
 
 @app.route('/api/status', methods=['GET'])
@@ -61,39 +258,50 @@ def get_status():
 
 @app.route('/api/rooms', methods=['POST'])
 def create_room():
-    data = request.get_json()
-    if not data or 'name' not in data:
-        return jsonify({'message': 'Room name is required'}), 400
-    new_room = Room(name=data['name'], status=data.get('status', 'Available'))
-    db.session.add(new_room)
+    body = request.get_data(cache=False)
+    try:
+        data = _room_create_decoder.decode(body)
+    except msgspec.ValidationError:
+        return jsonify({'message': _room_error_message(body)}), 400
+    except msgspec.DecodeError:
+        return jsonify({'message': _INVALID_JSON_MESSAGE}), 400
+    # Core INSERT ... RETURNING skips building a Room object and the ORM flush
+    stmt = insert(Room).values(name=data.name, status=data.status).returning(Room.id, Room.name, Room.status)
+    new_room = db.session.execute(stmt).one()
     db.session.commit()
+    _bust_cache()
     return jsonify({'message': 'Room created successfully', 'room': {'id': new_room.id, 'name': new_room.name, 'status': new_room.status}}), 201
 
 @app.route('/api/rooms', methods=['GET'])
 def get_all_rooms():
-    rooms = Room.query.order_by(Room.id).all()
-    output = []
-    for room in rooms:
-        room_data = {'id': room.id, 'name': room.name, 'status': room.status}
-        output.append(room_data)
-    return jsonify({'rooms': output})
+    # Only select the columns we return; each result row is already keyed by column name
+    def build():
+        rows = db.session.execute(_STMT_ALL_ROOMS).mappings().all()
+        return {'rooms': [dict(r) for r in rows]}
+    return _cached_json_response('rooms', build)
 
 @app.route('/api/rooms/<int:room_id>', methods=['PUT'])
 def update_room(room_id):
-    room = Room.query.get_or_404(room_id)
-    data = request.get_json()
+    room = db.session.get(Room, room_id)
+    if room is None:
+        abort(404)
+    data = _load_json_body()
     if not data:
         return jsonify({'message': 'No input data provided'}), 400
     room.name = data.get('name', room.name)
     room.status = data.get('status', room.status)
     db.session.commit()
+    _bust_cache()
     return jsonify({'message': 'Room updated successfully', 'room': {'id': room.id, 'name': room.name, 'status': room.status}})
 
 @app.route('/api/rooms/<int:room_id>', methods=['DELETE'])
 def delete_room(room_id):
-    room = Room.query.get_or_404(room_id)
+    room = db.session.get(Room, room_id)
+    if room is None:
+        abort(404)
     db.session.delete(room)
     db.session.commit()
+    _bust_cache()
     return jsonify({'message': 'Room deleted successfully'})
 
 # --- Booking CRUD Endpoints ---
@@ -103,69 +311,57 @@ def create_booking():
     """
     This endpoint creates a new booking.
     """
-    data = request.get_json()
-
-    # 1. Validation: Check for required fields
-    required_fields = ['guest_name', 'check_in_date', 'check_out_date', 'room_id']
-    if not all(field in data for field in required_fields):
-        return jsonify({'message': 'Missing required fields'}), 400
-
-    # 2. Date Conversion: Convert string dates from JSON to Python Date objects
+    # 1. Decode and validate: required fields, types and YYYY-MM-DD dates in one pass
+    body = request.get_data(cache=False)
     try:
-        check_in = datetime.strptime(data['check_in_date'], '%Y-%m-%d').date()
-        check_out = datetime.strptime(data['check_out_date'], '%Y-%m-%d').date()
-    except ValueError:
-        return jsonify({'message': 'Invalid date format. Please use YYYY-MM-DD.'}), 400
+        data = _booking_create_decoder.decode(body)
+    except msgspec.ValidationError:
+        return jsonify({'message': _booking_error_message(body)}), 400
+    except msgspec.DecodeError:
+        return jsonify({'message': _INVALID_JSON_MESSAGE}), 400
 
-    # 3. Validation: Check if the room exists
-    room_to_book = Room.query.get(data['room_id'])
+    # 2. Validation: Check if the room exists
+    room_to_book = db.session.get(Room, data.room_id)
     if not room_to_book:
         return jsonify({'message': 'Room not found with the provided ID'}), 404
 
     # Note: For a real-world app, we'd also add logic here to check
     # if the room is already booked for these dates. We'll add that later.
 
-    # 4. Create the new Booking object
-    new_booking = Booking(
-        guest_name=data['guest_name'],
-        check_in_date=check_in,
-        check_out_date=check_out,
-        room_id=data['room_id'],
-        num_adults=data.get('num_adults', 1),
-        num_children=data.get('num_children', 0),
-        phone_number=data.get('phone_number'),
-        email=data.get('email')
+    # 3. Insert the new booking row directly (no ORM object needed)
+    stmt = insert(Booking).values(
+        guest_name=data.guest_name,
+        check_in_date=data.check_in_date,
+        check_out_date=data.check_out_date,
+        room_id=data.room_id,
+        num_adults=data.num_adults,
+        num_children=data.num_children,
+        phone_number=data.phone_number,
+        email=data.email
         # We can leave payment details to be updated later
-    )
+    ).returning(Booking.id)
 
-    # 5. Save to the database
-    db.session.add(new_booking)
+    # 4. Save to the database
+    new_booking_id = db.session.execute(stmt).scalar_one()
     db.session.commit()
+    _bust_cache()
 
-    # 6. Return a success response
-    return jsonify({'message': 'Booking created successfully', 'booking_id': new_booking.id}), 201
+    # 5. Return a success response
+    return jsonify({'message': 'Booking created successfully', 'booking_id': new_booking_id}), 201
 
 @app.route('/api/bookings', methods=['GET'])
 def get_all_bookings():
     """
     This endpoint returns a list of all bookings.
     """
-    bookings = Booking.query.order_by(Booking.check_in_date).all()
-    output = []
-    for booking in bookings:
-        # Here we use the back-reference 'room' to get the room's name!
-        booking_data = {
-            'id': booking.id,
-            'guest_name': booking.guest_name,
-            'check_in_date': booking.check_in_date.strftime('%Y-%m-%d'),
-            'check_out_date': booking.check_out_date.strftime('%Y-%m-%d'),
-            'room_id': booking.room_id,
-            'room_name': booking.room.name  # The power of relationships!
-        }
-        output.append(booking_data)
-        
-    return jsonify({'bookings': output})
+    def build():
+        rows = db.session.execute(_STMT_ALL_BOOKINGS).mappings().all()
+        return {'bookings': [dict(r) for r in rows]}
+
+    return _cached_json_response('bookings', build)
 
 # --- This block allows you to run the app directly ---
+# For local development only. In production use gunicorn (see gunicorn.conf.py):
+#   gunicorn app:app
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
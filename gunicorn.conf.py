@@ -0,0 +1,22 @@
+# Production server settings. Run with:  gunicorn app:app
+
+bind = '0.0.0.0:8000'
+
+# Exactly one worker process, with threads for concurrency. The list cache in
+# app.py lives in process memory and is only cleared in the process that
+# handled a write, so extra workers would serve stale room/booking lists.
+# One process also means one SQLite writer instead of several competing ones.
+# Do not raise `workers` without moving that cache out of process.
+workers = 1
+worker_class = 'gthread'
+threads = 8
+
+# Import the app once in the master and fork the worker from it (copy-on-write)
+preload_app = True
+
+def post_fork(server, worker):
+    # Each worker must open its own SQLite connections rather than reuse
+    # any that were inherited from the master process
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,38 @@
+import pytest
+
+from app import app
+
+
+@pytest.fixture
+def client():
+    return app.test_client()
+
+
+# A type error msgspec hits first, followed by a JSON syntax error later in the body
+@pytest.mark.parametrize('path, body', [
+    ('/api/rooms', b'{"name": 1, garbage'),
+    ('/api/rooms', b'[1, 2'),
+    ('/api/bookings', b'{"guest_name": 5, oops'),
+])
+def test_type_error_then_malformed_json_returns_400(client, path, body):
+    response = client.post(path, data=body, content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json() == {'message': 'Request body must be valid JSON'}
+
+
+@pytest.mark.parametrize('path', ['/api/rooms', '/api/bookings'])
+def test_malformed_json_returns_400(client, path):
+    response = client.post(path, data=b'{bad', content_type='application/json')
+    assert response.status_code == 400
+    assert response.get_json() == {'message': 'Request body must be valid JSON'}
+
+
+def test_json_responses_follow_provider_sort_keys():
+    with app.app_context():
+        assert app.json.response({'b': 1, 'a': 2}).data == b'{"a":2,"b":1}'
+        assert app.json.dumps({'b': 1, 'a': 2}) == '{"a":2,"b":1}'
+        app.json.sort_keys = False
+        try:
+            assert app.json.response({'b': 1, 'a': 2}).data == b'{"b":1,"a":2}'
+        finally:
+            app.json.sort_keys = True